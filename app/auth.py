@@ -1,21 +1,60 @@
-from datetime import datetime, timezone, timedelta
-from jose import jwt
-from passlib.context import CryptContext
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from .config import settings
+from .redis_client import redis_client
 
-pwd_context = CryptContext(schemes=['argon2'], deprecated='auto')
+pwd_context = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _check_hash_speed():
+    # Fail closed if the argon2 build is slower than expected (e.g. the generic
+    # wheel got installed instead of the target-CPU libargon2 from the Dockerfile).
+    start = time.perf_counter()
+    pwd_context.hash('argon2-self-check')
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"argon2 self-check hash took {elapsed_ms:.1f} ms")
+    if elapsed_ms > settings.ARGON2_MAX_HASH_MS:
+        raise RuntimeError(
+            f"argon2 hash took {elapsed_ms:.1f} ms, above ARGON2_MAX_HASH_MS={settings.ARGON2_MAX_HASH_MS}"
+        )
+
+
+if settings.ARGON2_MAX_HASH_MS:
+    _check_hash_speed()
+
+# PyJWT signs HS256 through hmac.new(..., hashlib.sha256), which only reaches
+# OpenSSL's EVP code (and SHA-NI / ARMv8 SHA extensions) when hashlib is
+# OpenSSL-backed. Warn if this interpreter fell back to the builtin SHA-256.
+if hashlib.sha256.__module__ != '_hashlib':
+    logger.warning("hashlib.sha256 is not OpenSSL-backed; JWT HMAC-SHA256 will not use SHA CPU extensions")
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return pwd_context.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    # Integer NumericDate avoids building datetimes just to serialise them
+    expire = int(time.time()) + int(expires_delta.total_seconds() if expires_delta else settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
     to_encode.update({'exp': expire})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm='HS256')
     return encoded_jwt
@@ -23,15 +62,28 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS))
+    expire = int(time.time()) + int(expires_delta.total_seconds() if expires_delta else settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
     to_encode.update({'exp': expire, 'type': 'refresh'})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET, algorithm='HS256')
     return encoded_jwt
 
 
+def _token_cache_key(token: str) -> str:
+    # Key on a digest so raw JWTs are never stored in Redis
+    return f"jwt:{hashlib.blake2b(token.encode(), digest_size=16).hexdigest()}"
+
+
 def decode_token(token: str) -> dict:
+    cache_key = _token_cache_key(token) if redis_client else None
+    if cache_key:
+        cached = redis_client.get(cache_key)
+        if cached:
+            return json.loads(cached)
     try:
         payload = jwt.decode(token, settings.JWT_SECRET, algorithms=['HS256'])
-        return payload
     except Exception:
         return {}
+    if cache_key and 'exp' in payload:
+        # Expire the cached claims exactly when the token itself expires
+        redis_client.set(cache_key, json.dumps(payload), exat=int(payload['exp']))
+    return payload
@@ -10,6 +10,13 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     HOLD_TTL_SECONDS: int = 600
     CANCELLATION_WINDOW_MINUTES: int = 60
+    # Dev convenience; production runs `python -m app.init_db` once instead of
+    # having every worker probe the schema on import
+    RUN_DDL_ON_IMPORT: bool = True
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    ARGON2_MAX_HASH_MS: float | None = None  # import-time argon2 speed check, disabled when unset
 
     model_config = ConfigDict(env_file='.env')
 
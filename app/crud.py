@@ -1,3 +1,5 @@
+import itertools
+from sqlalchemy import bindparam, insert, lambda_stmt, select, text, update
 from sqlalchemy.orm import Session
 from . import models, schemas
 from .auth import get_password_hash
@@ -12,14 +14,36 @@ def create_user(db: Session, user_in: schemas.UserCreate):
     db.refresh(user)
     return user
 
+# Lookups below use lambda_stmt so the statement is built and compiled once per
+# call site; later calls only rebind the parameter values.
+
 # fetch by email
 
 def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+    stmt = lambda_stmt(lambda: select(models.User).where(models.User.email == email))
+    return db.execute(stmt).scalars().first()
 
 
 # ADMIN CRUD OPERATIONS
 
+def _update_by_id(db: Session, model, obj_id: int, values: dict) -> bool:
+    """Apply values with one UPDATE statement, skipping the load + setattr round trip."""
+    result = db.execute(update(model).where(model.id == obj_id).values(**values))
+    db.commit()
+    return result.rowcount > 0
+
+
+def _create_batch(db: Session, model, items: list) -> list:
+    """Insert items in one flush/commit and reload them with a single SELECT, in input order."""
+    objs = [model(**item.dict()) for item in items]
+    db.add_all(objs)
+    db.flush()
+    ids = [obj.id for obj in objs]
+    db.commit()
+    by_id = {obj.id: obj for obj in db.query(model).filter(model.id.in_(ids))}
+    return [by_id[obj_id] for obj_id in ids]
+
+
 # Movies
 def create_movie(db: Session, movie_in: schemas.MovieCreate):
     movie = models.Movie(**movie_in.dict())
@@ -29,23 +53,23 @@ def create_movie(db: Session, movie_in: schemas.MovieCreate):
     return movie
 
 
+def create_movies_batch(db: Session, movies_in: list[schemas.MovieCreate]):
+    return _create_batch(db, models.Movie, movies_in)
+
+
 def get_movies(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Movie).offset(skip).limit(limit).all()
 
 
 def get_movie(db: Session, movie_id: int):
-    return db.query(models.Movie).filter(models.Movie.id == movie_id).first()
+    stmt = lambda_stmt(lambda: select(models.Movie).where(models.Movie.id == movie_id))
+    return db.execute(stmt).scalars().first()
 
 
 def update_movie(db: Session, movie_id: int, movie_in: schemas.MovieCreate):
-    movie = get_movie(db, movie_id)
-    if not movie:
+    if not _update_by_id(db, models.Movie, movie_id, movie_in.dict()):
         return None
-    for key, value in movie_in.dict().items():
-        setattr(movie, key, value)
-    db.commit()
-    db.refresh(movie)
-    return movie
+    return get_movie(db, movie_id)
 
 
 def delete_movie(db: Session, movie_id: int):
@@ -65,23 +89,23 @@ def create_auditorium(db: Session, auditorium_in: schemas.AuditoriumCreate):
     return auditorium
 
 
+def create_auditoriums_batch(db: Session, auditoriums_in: list[schemas.AuditoriumCreate]):
+    return _create_batch(db, models.Auditorium, auditoriums_in)
+
+
 def get_auditoriums(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Auditorium).offset(skip).limit(limit).all()
 
 
 def get_auditorium(db: Session, auditorium_id: int):
-    return db.query(models.Auditorium).filter(models.Auditorium.id == auditorium_id).first()
+    stmt = lambda_stmt(lambda: select(models.Auditorium).where(models.Auditorium.id == auditorium_id))
+    return db.execute(stmt).scalars().first()
 
 
 def update_auditorium(db: Session, auditorium_id: int, auditorium_in: schemas.AuditoriumCreate):
-    auditorium = get_auditorium(db, auditorium_id)
-    if not auditorium:
+    if not _update_by_id(db, models.Auditorium, auditorium_id, auditorium_in.dict()):
         return None
-    for key, value in auditorium_in.dict().items():
-        setattr(auditorium, key, value)
-    db.commit()
-    db.refresh(auditorium)
-    return auditorium
+    return get_auditorium(db, auditorium_id)
 
 
 def delete_auditorium(db: Session, auditorium_id: int):
@@ -101,24 +125,68 @@ def create_seat(db: Session, seat_in: schemas.SeatCreate):
     return seat
 
 
+_SEAT_INSERT_CHUNK = 10000
+
+# Generate the rows x seats_per_row grid inside the database so only a handful
+# of parameters cross the wire regardless of auditorium size
+_SEAT_GRID_SQL = {
+    'postgresql': """
+        INSERT INTO seats (auditorium_id, row_label, seat_number, seat_type, price_modifier)
+        SELECT :auditorium_id, chr(64 + r.i), n.j, :seat_type, :price_modifier
+        FROM generate_series(1, :rows) AS r(i), generate_series(1, :seats_per_row) AS n(j)
+        ORDER BY r.i, n.j
+    """,
+    'sqlite': """
+        INSERT INTO seats (auditorium_id, row_label, seat_number, seat_type, price_modifier)
+        WITH RECURSIVE
+            r(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM r WHERE i < :rows),
+            n(j) AS (SELECT 1 UNION ALL SELECT j + 1 FROM n WHERE j < :seats_per_row)
+        SELECT :auditorium_id, char(64 + i), j, :seat_type, :price_modifier
+        FROM r, n
+        ORDER BY i, j
+    """,
+}
+
+
 def create_seats_batch(db: Session, auditorium_id: int, rows: int, seats_per_row: int, 
                        seat_type: str = 'regular', price_modifier: float = 0):
-    """Create multiple seats for an auditorium in batch."""
-    seats = []
-    for row in range(1, rows + 1):
-        row_label = chr(64 + row)  # A, B, C, etc.
-        for seat_num in range(1, seats_per_row + 1):
-            seat = models.Seat(
-                auditorium_id=auditorium_id,
-                row_label=row_label,
-                seat_number=seat_num,
-                seat_type=seat_type,
-                price_modifier=price_modifier
-            )
-            seats.append(seat)
-    db.add_all(seats)
+    """Create multiple seats for an auditorium in batch. Returns the number of seats created."""
+    count = _insert_seats(db, auditorium_id, rows, seats_per_row, seat_type, price_modifier)
     db.commit()
-    return seats
+    return count
+
+
+def _insert_seats(db: Session, auditorium_id: int, rows: int, seats_per_row: int,
+                  seat_type: str, price_modifier: float) -> int:
+    """Insert a rows x seats_per_row grid without committing. Returns the number of seats."""
+    grid_sql = _SEAT_GRID_SQL.get(db.get_bind().dialect.name)
+    if grid_sql and rows > 0 and seats_per_row > 0:
+        stmt = text(grid_sql).bindparams(bindparam('price_modifier', type_=models.Seat.price_modifier.type))
+        db.execute(stmt, {
+            'auditorium_id': auditorium_id,
+            'rows': rows,
+            'seats_per_row': seats_per_row,
+            'seat_type': seat_type,
+            'price_modifier': price_modifier
+        })
+        return rows * seats_per_row
+
+    row_labels = [chr(64 + row) for row in range(1, rows + 1)]  # A, B, C, etc.
+    rows_list = [
+        {
+            'auditorium_id': auditorium_id,
+            'row_label': row_label,
+            'seat_number': seat_num,
+            'seat_type': seat_type,
+            'price_modifier': price_modifier
+        }
+        for row_label, seat_num in itertools.product(row_labels, range(1, seats_per_row + 1))
+    ]
+    # Core executemany skips ORM unit-of-work bookkeeping for every seat; very large
+    # grids are sent in bounded chunks, all inside one transaction
+    for start in range(0, len(rows_list), _SEAT_INSERT_CHUNK):
+        db.execute(insert(models.Seat), rows_list[start:start + _SEAT_INSERT_CHUNK])
+    return len(rows_list)
 
 
 def get_seats_by_auditorium(db: Session, auditorium_id: int):
@@ -126,7 +194,8 @@ def get_seats_by_auditorium(db: Session, auditorium_id: int):
 
 
 def get_seat(db: Session, seat_id: int):
-    return db.query(models.Seat).filter(models.Seat.id == seat_id).first()
+    stmt = lambda_stmt(lambda: select(models.Seat).where(models.Seat.id == seat_id))
+    return db.execute(stmt).scalars().first()
 
 
 def delete_seat(db: Session, seat_id: int):
@@ -140,11 +209,11 @@ def delete_seat(db: Session, seat_id: int):
 # Showtimes
 def create_showtime(db: Session, showtime_in: schemas.ShowtimeCreate):
     # Check for overlaps with same auditorium
-    overlapping = db.query(models.Showtime).filter(
+    overlapping = db.query(db.query(models.Showtime).filter(
         models.Showtime.auditorium_id == showtime_in.auditorium_id,
         models.Showtime.starts_at < showtime_in.ends_at,
         models.Showtime.ends_at > showtime_in.starts_at
-    ).first()
+    ).exists()).scalar()
     
     if overlapping:
         return None  # Overlap detected
@@ -156,35 +225,62 @@ def create_showtime(db: Session, showtime_in: schemas.ShowtimeCreate):
     return showtime
 
 
+def _overlaps_within(showtimes_in: list[schemas.ShowtimeCreate]) -> bool:
+    """True if any two showtimes in the batch overlap in the same auditorium."""
+    for i, showtime_in in enumerate(showtimes_in):
+        for other in showtimes_in[:i]:
+            if (other.auditorium_id == showtime_in.auditorium_id
+                    and other.starts_at < showtime_in.ends_at
+                    and other.ends_at > showtime_in.starts_at):
+                return True
+    return False
+
+
+def _overlaps_existing(db: Session, showtime_in: schemas.ShowtimeCreate) -> bool:
+    """True if the showtime overlaps a stored showtime in the same auditorium."""
+    return db.query(db.query(models.Showtime).filter(
+        models.Showtime.auditorium_id == showtime_in.auditorium_id,
+        models.Showtime.starts_at < showtime_in.ends_at,
+        models.Showtime.ends_at > showtime_in.starts_at
+    ).exists()).scalar()
+
+
+def _batch_overlaps(db: Session, showtimes_in: list[schemas.ShowtimeCreate]) -> bool:
+    """True if any showtime overlaps an existing one or another showtime in the same batch."""
+    return _overlaps_within(showtimes_in) or any(_overlaps_existing(db, st) for st in showtimes_in)
+
+
+def create_showtimes_batch(db: Session, showtimes_in: list[schemas.ShowtimeCreate]):
+    # All-or-nothing: reject the whole batch on any overlap
+    if _batch_overlaps(db, showtimes_in):
+        return None
+    return _create_batch(db, models.Showtime, showtimes_in)
+
+
 def get_showtimes(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Showtime).offset(skip).limit(limit).all()
 
 
 def get_showtime(db: Session, showtime_id: int):
-    return db.query(models.Showtime).filter(models.Showtime.id == showtime_id).first()
+    stmt = lambda_stmt(lambda: select(models.Showtime).where(models.Showtime.id == showtime_id))
+    return db.execute(stmt).scalars().first()
 
 
 def update_showtime(db: Session, showtime_id: int, showtime_in: schemas.ShowtimeCreate):
-    showtime = get_showtime(db, showtime_id)
-    if not showtime:
-        return None
-    
     # Check for overlaps (excluding current showtime)
-    overlapping = db.query(models.Showtime).filter(
+    overlapping = db.query(db.query(models.Showtime).filter(
         models.Showtime.id != showtime_id,
         models.Showtime.auditorium_id == showtime_in.auditorium_id,
         models.Showtime.starts_at < showtime_in.ends_at,
         models.Showtime.ends_at > showtime_in.starts_at
-    ).first()
+    ).exists()).scalar()
     
     if overlapping:
         return None  # Overlap detected
     
-    for key, value in showtime_in.dict().items():
-        setattr(showtime, key, value)
-    db.commit()
-    db.refresh(showtime)
-    return showtime
+    if not _update_by_id(db, models.Showtime, showtime_id, showtime_in.dict()):
+        return None
+    return get_showtime(db, showtime_id)
 
 
 def delete_showtime(db: Session, showtime_id: int):
@@ -193,3 +289,72 @@ def delete_showtime(db: Session, showtime_id: int):
         db.delete(showtime)
         db.commit()
     return showtime
+
+
+# Seed
+def _seed_rows(db: Session, model, key: str, items: list):
+    """Resolve items to row ids by natural key, inserting only keys not already present.
+
+    Returns the ids in input order and the set of ids that were newly inserted.
+    """
+    column = getattr(model, key)
+    keys = [getattr(item, key) for item in items]
+    ids = dict(db.query(column, model.id).filter(column.in_(keys)).all())
+    new = {}
+    for item in items:
+        item_key = getattr(item, key)
+        if item_key not in ids and item_key not in new:
+            new[item_key] = model(**item.dict())
+    db.add_all(new.values())
+    db.flush()
+    ids.update((item_key, obj.id) for item_key, obj in new.items())
+    return [ids[item_key] for item_key in keys], {obj.id for obj in new.values()}
+
+
+def seed(db: Session, seed_in: schemas.SeedIn):
+    """Insert a whole fixture (movies, auditoriums, seats, showtimes) in one transaction.
+
+    Seat layouts and showtimes refer to movies/auditoriums by their index in the
+    payload. Re-running a fixture only adds what is missing: movies and
+    auditoriums are matched by title/name, seats are only added to newly created
+    auditoriums and showtimes that overlap a stored one (including an identical
+    earlier run) are skipped and reported by payload index. Returns None
+    (nothing written) if two showtimes in the payload overlap each other.
+    """
+    movie_ids, _ = _seed_rows(db, models.Movie, 'title', seed_in.movies)
+    auditorium_ids, new_auditorium_ids = _seed_rows(db, models.Auditorium, 'name', seed_in.auditoriums)
+
+    seat_count = 0
+    for layout in seed_in.seats:
+        auditorium_id = auditorium_ids[layout.auditorium_index]
+        if auditorium_id in new_auditorium_ids:
+            seat_count += _insert_seats(db, auditorium_id, layout.rows, layout.seats_per_row,
+                                        layout.seat_type, layout.price_modifier)
+
+    showtimes_in = [
+        schemas.ShowtimeCreate(
+            movie_id=movie_ids[st.movie_index],
+            auditorium_id=auditorium_ids[st.auditorium_index],
+            starts_at=st.starts_at,
+            ends_at=st.ends_at,
+            base_price=st.base_price
+        )
+        for st in seed_in.showtimes
+    ]
+    if _overlaps_within(showtimes_in):
+        db.rollback()
+        return None
+    skipped = [i for i, st in enumerate(showtimes_in) if _overlaps_existing(db, st)]
+    showtimes = [models.Showtime(**st.dict()) for i, st in enumerate(showtimes_in) if i not in skipped]
+    db.add_all(showtimes)
+    db.flush()
+    showtime_ids = [st.id for st in showtimes]
+
+    db.commit()
+    return {
+        'movies': movie_ids,
+        'auditoriums': auditorium_ids,
+        'seats': seat_count,
+        'showtimes': showtime_ids,
+        'skipped_showtimes': skipped
+    }
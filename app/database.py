@@ -2,7 +2,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# FastAPI runs sync endpoints and dependency teardown on different threadpool
+# threads, so SQLite connections must be usable across threads
+connect_args = {'check_same_thread': False} if settings.DATABASE_URL.startswith('sqlite') else {}
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
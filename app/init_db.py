@@ -0,0 +1,11 @@
+"""Create database tables. Run once per deployment: python -m app.init_db"""
+from .database import engine, Base
+from . import models  # noqa: F401  (registers tables on Base.metadata)
+
+
+def init_db():
+    Base.metadata.create_all(bind=engine)
+
+
+if __name__ == '__main__':
+    init_db()
@@ -1,19 +1,27 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import and_, case, insert, select
 from sqlalchemy.orm import Session
 from . import models, schemas, crud
-from .database import engine, Base, get_db
+from .database import get_db
+from .init_db import init_db
 from .config import settings
 from fastapi import Body
-from .auth import verify_password, create_access_token, create_refresh_token, decode_token
-from .redis_client import redis_client
-from datetime import datetime, timedelta
+from .auth import get_password_hash, verify_password, create_access_token, create_refresh_token, decode_token
+from .redis_client import redis_client, hold_seats_script
+import time
+from datetime import datetime, timezone
 
 # create tables (dev only)
-Base.metadata.create_all(bind=engine)
+if settings.RUN_DDL_ON_IMPORT:
+    init_db()
 
 app = FastAPI(title='Movie Reservation API - Starter')
 
+# Hashed once at import; verified against when a login email has no account
+_DUMMY_HASH = get_password_hash('not-a-real-password')
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -40,7 +48,9 @@ def health():
 @app.post('/auth/login', response_model=schemas.LoginResponse)
 def login(form_data: schemas.LoginIn, db: Session = Depends(get_db)):
     user = crud.get_user_by_email(db, form_data.email)
-    if not user or not verify_password(form_data.password, user.password_hash):
+    # Always run one argon2 verify so unknown emails take as long as wrong passwords
+    password_ok = verify_password(form_data.password, user.password_hash if user else _DUMMY_HASH)
+    if not user or not password_ok:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Incorrect email or password')
     access_token = create_access_token({'sub': str(user.id)})
     refresh_token = create_refresh_token({'sub': str(user.id)})
@@ -60,41 +70,45 @@ def refresh_token(body: dict = Body(...), db: Session = Depends(get_db)):
     if not data or data.get('type') != 'refresh' or 'sub' not in data:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid refresh token')
     user_id = int(data.get('sub'))
-    user = db.query(models.User).get(user_id)
-    if not user:
+    # Only existence matters here, so fetch the bare id instead of a full User row
+    user_id = db.execute(select(models.User.id).where(models.User.id == user_id)).scalar()
+    if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='User not found')
-    access_token = create_access_token({'sub': str(user.id)})
+    access_token = create_access_token({'sub': str(user_id)})
     return {'access_token': access_token, 'token_type': 'bearer'}
 
 
-@app.get('/showtimes/{showtime_id}/seats', response_model=list[schemas.SeatStatusOut])
+# Hot endpoint: rows are already plain dicts of a fixed shape, so skip response_model
+# validation and serialise with orjson. The model is kept for the OpenAPI docs only.
+@app.get('/showtimes/{showtime_id}/seats', responses={200: {'model': list[schemas.SeatStatusOut]}})
 def get_seats(showtime_id: int, db: Session = Depends(get_db)):
     """Get all seats for a showtime with their status (available, held, booked)."""
-    seats = db.query(models.Seat).all()
-
-    booked = db.query(models.BookedSeat.seat_id).filter(models.BookedSeat.showtime_id == showtime_id).all()
-    booked_ids = {s[0] for s in booked}
-
-    held_ids = set()
+    # Single join: only the showtime's auditorium seats, with booked status resolved in SQL
+    seats = db.query(
+        models.Seat.id,
+        models.Seat.row_label,
+        models.Seat.seat_number,
+        models.Seat.seat_type,
+        case((models.BookedSeat.seat_id.isnot(None), 'booked'), else_='available').label('status')
+    ).join(
+        models.Showtime, models.Showtime.auditorium_id == models.Seat.auditorium_id
+    ).outerjoin(
+        models.BookedSeat,
+        and_(models.BookedSeat.seat_id == models.Seat.id, models.BookedSeat.showtime_id == models.Showtime.id)
+    ).filter(models.Showtime.id == showtime_id).all()
+
+    response = [dict(s._mapping) for s in seats]
+
+    # Only the Redis holds are merged in Python, and only when there are any
     if redis_client:
-        held_keys = redis_client.keys(f'hold:{showtime_id}:*')
-        held_ids = {int(k.split(':')[-1]) for k in held_keys}
-
-    response = []
-    for s in seats:
-        status = 'available'
-        if s.id in booked_ids:
-            status = 'booked'
-        elif s.id in held_ids:
-            status = 'held'
-        response.append({
-            'id': s.id,
-            'row_label': s.row_label,
-            'seat_number': s.seat_number,
-            'seat_type': s.seat_type,
-            'status': status
-        })
-    return response
+        now = int(time.time())
+        holds = redis_client.hgetall(f'holds:{showtime_id}')
+        held_ids = {int(sid) for sid, expires in holds.items() if int(expires) > now}
+        if held_ids:
+            for seat in response:
+                if seat['status'] == 'available' and seat['id'] in held_ids:
+                    seat['status'] = 'held'
+    return Response(content=orjson.dumps(response), media_type='application/json')
 
 
 @app.post('/showtimes/{showtime_id}/holds', response_model=schemas.HoldSeatsResponse)
@@ -105,24 +119,18 @@ def hold_seats(showtime_id: int, req: schemas.HoldSeatsRequest, db: Session = De
     
     seat_ids = req.seat_ids
     
-    # Check seats exist
-    seats = db.query(models.Seat).filter(models.Seat.id.in_(seat_ids)).all()
-    if len(seats) != len(seat_ids):
+    # Check seats exist and are not booked in one query
+    rows = db.query(models.Seat.id, models.BookedSeat.seat_id).outerjoin(
+        models.BookedSeat,
+        and_(models.BookedSeat.seat_id == models.Seat.id, models.BookedSeat.showtime_id == showtime_id)
+    ).filter(models.Seat.id.in_(seat_ids)).all()
+    found = {r.id for r in rows}
+    if len(found) != len(seat_ids):
         raise HTTPException(status_code=400, detail='Invalid seat selection')
-
-    # Check booked
-    booked = db.query(models.BookedSeat.seat_id).filter(
-        models.BookedSeat.showtime_id == showtime_id,
-        models.BookedSeat.seat_id.in_(seat_ids)
-    ).all()
-    if booked:
+    if any(r.seat_id is not None for r in rows):
         raise HTTPException(status_code=409, detail='Some seats already booked')
 
-    # Check held (redis)
-    if redis_client:
-        for sid in seat_ids:
-            if redis_client.get(f'hold:{showtime_id}:{sid}'):
-                raise HTTPException(status_code=409, detail='Some seats are held')
+    hold_expires = int(time.time()) + settings.HOLD_TTL_SECONDS
 
     # Create temporary reservation (no user_id for demo, can be added with auth)
     reservation = models.Reservation(
@@ -130,20 +138,21 @@ def hold_seats(showtime_id: int, req: schemas.HoldSeatsRequest, db: Session = De
         showtime_id=showtime_id,
         status='held',
         total_price=0,
-        expires_at=datetime.utcnow() + timedelta(seconds=settings.HOLD_TTL_SECONDS)
+        expires_at=datetime.fromtimestamp(hold_expires, tz=timezone.utc)
     )
     db.add(reservation)
-    db.commit()
-    db.refresh(reservation)
+    db.flush()  # assigns reservation.id; committed only once the seats are held
 
-    # Reserve in Redis with TTL
+    # Check-and-hold all seats atomically in Redis (one round trip)
     if redis_client:
-        for sid in seat_ids:
-            redis_client.setex(
-                f'hold:{showtime_id}:{sid}',
-                settings.HOLD_TTL_SECONDS,
-                reservation.id
-            )
+        keys = [f'hold:{showtime_id}:{sid}' for sid in seat_ids]
+        keys += [f'holds:{showtime_id}', f'held:{showtime_id}:{reservation.id}']
+        if not hold_seats_script(keys=keys, args=[settings.HOLD_TTL_SECONDS, reservation.id, hold_expires, *seat_ids]):
+            db.rollback()
+            raise HTTPException(status_code=409, detail='Some seats are held')
+
+    db.commit()
+    db.refresh(reservation)
 
     return {'reservation_id': reservation.id, 'expires_at': reservation.expires_at}
 
@@ -162,22 +171,17 @@ def confirm_reservation(reservation_id: int, db: Session = Depends(get_db)):
     # Get held seats from Redis
     held_seats = []
     if redis_client:
-        pattern = f'hold:{reservation.showtime_id}:*'
-        keys = redis_client.keys(pattern)
-        held_seats = [int(k.split(':')[-1]) for k in keys if redis_client.get(k) == str(reservation_id)]
+        held_seats = [int(sid) for sid in redis_client.smembers(f'held:{reservation.showtime_id}:{reservation.id}')]
 
     if not held_seats:
         raise HTTPException(status_code=400, detail='Hold expired or no seats held')
 
     # Finalize booking inside transaction
     try:
-        for sid in held_seats:
-            booked = models.BookedSeat(
-                showtime_id=reservation.showtime_id,
-                seat_id=sid,
-                reservation_id=reservation.id
-            )
-            db.add(booked)
+        db.execute(insert(models.BookedSeat), [
+            {'showtime_id': reservation.showtime_id, 'seat_id': sid, 'reservation_id': reservation.id}
+            for sid in held_seats
+        ])
         reservation.status = 'confirmed'
         db.commit()
     except Exception as e:
@@ -186,8 +190,13 @@ def confirm_reservation(reservation_id: int, db: Session = Depends(get_db)):
 
     # Clear Redis holds
     if redis_client:
-        for sid in held_seats:
-            redis_client.delete(f'hold:{reservation.showtime_id}:{sid}')
+        pipe = redis_client.pipeline()
+        pipe.delete(
+            f'held:{reservation.showtime_id}:{reservation.id}',
+            *[f'hold:{reservation.showtime_id}:{sid}' for sid in held_seats]
+        )
+        pipe.hdel(f'holds:{reservation.showtime_id}', *held_seats)
+        pipe.execute()
 
     return {'status': 'confirmed', 'reservation_id': reservation.id}
 
@@ -198,12 +207,19 @@ def confirm_reservation(reservation_id: int, db: Session = Depends(get_db)):
 
 # MOVIES
 @app.post('/admin/movies', response_model=schemas.MovieOut)
-def create_movie(movie_in: schemas.MovieCreate, db: Session = Depends(get_db)):
+def create_movie(movie_in: schemas.MovieCreate, response: Response, db: Session = Depends(get_db)):
     """Create a new movie."""
     movie = crud.create_movie(db, movie_in)
+    response.headers['Location'] = f'/admin/movies/{movie.id}'
     return movie
 
 
+@app.post('/admin/movies/batch', response_model=list[schemas.MovieOut])
+def create_movies_batch(movies_in: list[schemas.MovieCreate], db: Session = Depends(get_db)):
+    """Create several movies in one transaction. Returns them in request order."""
+    return crud.create_movies_batch(db, movies_in)
+
+
 @app.get('/admin/movies', response_model=list[schemas.MovieOut])
 def list_movies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all movies with pagination."""
@@ -240,12 +256,19 @@ def delete_movie(movie_id: int, db: Session = Depends(get_db)):
 
 # AUDITORIUMS
 @app.post('/admin/auditoriums', response_model=schemas.AuditoriumOut)
-def create_auditorium(auditorium_in: schemas.AuditoriumCreate, db: Session = Depends(get_db)):
+def create_auditorium(auditorium_in: schemas.AuditoriumCreate, response: Response, db: Session = Depends(get_db)):
     """Create a new auditorium."""
     auditorium = crud.create_auditorium(db, auditorium_in)
+    response.headers['Location'] = f'/admin/auditoriums/{auditorium.id}'
     return auditorium
 
 
+@app.post('/admin/auditoriums/batch', response_model=list[schemas.AuditoriumOut])
+def create_auditoriums_batch(auditoriums_in: list[schemas.AuditoriumCreate], db: Session = Depends(get_db)):
+    """Create several auditoriums in one transaction. Returns them in request order."""
+    return crud.create_auditoriums_batch(db, auditoriums_in)
+
+
 @app.get('/admin/auditoriums', response_model=list[schemas.AuditoriumOut])
 def list_auditoriums(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all auditoriums with pagination."""
@@ -288,7 +311,7 @@ def create_seats_batch(auditorium_id: int, batch_in: schemas.SeatCreateBatch, db
     if not auditorium:
         raise HTTPException(status_code=404, detail='Auditorium not found')
     
-    seats = crud.create_seats_batch(
+    count = crud.create_seats_batch(
         db,
         auditorium_id=auditorium_id,
         rows=batch_in.rows,
@@ -296,7 +319,7 @@ def create_seats_batch(auditorium_id: int, batch_in: schemas.SeatCreateBatch, db
         seat_type=batch_in.seat_type,
         price_modifier=batch_in.price_modifier
     )
-    return {'status': 'created', 'count': len(seats), 'auditorium_id': auditorium_id}
+    return {'status': 'created', 'count': count, 'auditorium_id': auditorium_id}
 
 
 @app.get('/admin/auditoriums/{auditorium_id}/seats', response_model=list[schemas.SeatOut])
@@ -320,14 +343,24 @@ def delete_seat(seat_id: int, db: Session = Depends(get_db)):
 
 # SHOWTIMES
 @app.post('/admin/showtimes', response_model=schemas.ShowtimeOut)
-def create_showtime(showtime_in: schemas.ShowtimeCreate, db: Session = Depends(get_db)):
+def create_showtime(showtime_in: schemas.ShowtimeCreate, response: Response, db: Session = Depends(get_db)):
     """Create a new showtime with overlap validation."""
     showtime = crud.create_showtime(db, showtime_in)
     if not showtime:
         raise HTTPException(status_code=409, detail='Showtime overlaps with existing showtime in same auditorium')
+    response.headers['Location'] = f'/admin/showtimes/{showtime.id}'
     return showtime
 
 
+@app.post('/admin/showtimes/batch', response_model=list[schemas.ShowtimeOut])
+def create_showtimes_batch(showtimes_in: list[schemas.ShowtimeCreate], db: Session = Depends(get_db)):
+    """Create several showtimes in one transaction with overlap validation. Returns them in request order."""
+    showtimes = crud.create_showtimes_batch(db, showtimes_in)
+    if showtimes is None:
+        raise HTTPException(status_code=409, detail='Showtime overlaps with existing showtime in same auditorium')
+    return showtimes
+
+
 @app.get('/admin/showtimes', response_model=list[schemas.ShowtimeOut])
 def list_showtimes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """List all showtimes with pagination."""
@@ -360,3 +393,19 @@ def delete_showtime(showtime_id: int, db: Session = Depends(get_db)):
     if not showtime:
         raise HTTPException(status_code=404, detail='Showtime not found')
     return {'status': 'deleted', 'id': showtime_id}
+
+
+# SEED
+@app.post('/admin/seed', response_model=schemas.SeedOut)
+def seed(seed_in: schemas.SeedIn, db: Session = Depends(get_db)):
+    """Load a full fixture (movies, auditoriums, seats, showtimes) in a single transaction."""
+    n_movies, n_auditoriums = len(seed_in.movies), len(seed_in.auditoriums)
+    if any(not 0 <= layout.auditorium_index < n_auditoriums for layout in seed_in.seats) or any(
+        not (0 <= st.movie_index < n_movies and 0 <= st.auditorium_index < n_auditoriums)
+        for st in seed_in.showtimes
+    ):
+        raise HTTPException(status_code=400, detail='Seed references an unknown movie or auditorium index')
+    result = crud.seed(db, seed_in)
+    if result is None:
+        raise HTTPException(status_code=409, detail='Seed contains showtimes that overlap each other in the same auditorium')
+    return result
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Numeric, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Numeric, Boolean, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -36,7 +36,7 @@ class Auditorium(Base):
 class Seat(Base):
     __tablename__ = 'seats'
     id = Column(Integer, primary_key=True, index=True)
-    auditorium_id = Column(Integer, ForeignKey('auditoriums.id', ondelete='CASCADE'))
+    auditorium_id = Column(Integer, ForeignKey('auditoriums.id', ondelete='CASCADE'), index=True)
     row_label = Column(String)
     seat_number = Column(Integer)
     seat_type = Column(String, default='regular')
@@ -55,6 +55,11 @@ class Showtime(Base):
     movie = relationship('Movie')
     auditorium = relationship('Auditorium')
 
+    # Range index for the auditorium overlap probe in crud.create_showtime/update_showtime
+    __table_args__ = (
+        Index('ix_showtimes_aud_start_end', 'auditorium_id', 'starts_at', 'ends_at'),
+    )
+
 
 class Reservation(Base):
     __tablename__ = 'reservations'
@@ -82,6 +87,7 @@ class BookedSeat(Base):
     seat_id = Column(Integer, ForeignKey('seats.id', ondelete='CASCADE'))
     reservation_id = Column(Integer, ForeignKey('reservations.id', ondelete='CASCADE'))
 
+    # uq_showtime_seat also serves as the (showtime_id, seat_id) lookup index
     __table_args__ = (
         UniqueConstraint('showtime_id', 'seat_id', name='uq_showtime_seat'),
     )
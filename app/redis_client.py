@@ -10,3 +10,28 @@ try:
 except Exception as e:
     logger.warning(f"Redis connection failed: {e}. Running without Redis cache.")
     redis_client = None
+
+# Atomically hold a set of seats: fails (returns 0) if any seat is already held,
+# otherwise sets every per-seat hold key plus the per-showtime hold index and the
+# per-reservation seat set in one round trip.
+# KEYS: hold:{showtime}:{seat}..., holds:{showtime}, held:{showtime}:{reservation}
+# ARGV: ttl, reservation_id, expires_at_epoch, seat_id...
+HOLD_SEATS_LUA = """
+local n = #KEYS - 2
+for i = 1, n do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        return 0
+    end
+end
+local ttl, reservation_id, expires_at = ARGV[1], ARGV[2], ARGV[3]
+for i = 1, n do
+    redis.call('SETEX', KEYS[i], ttl, reservation_id)
+    redis.call('HSET', KEYS[n + 1], ARGV[3 + i], expires_at)
+    redis.call('SADD', KEYS[n + 2], ARGV[3 + i])
+end
+redis.call('EXPIRE', KEYS[n + 1], ttl)
+redis.call('EXPIRE', KEYS[n + 2], ttl)
+return 1
+"""
+
+hold_seats_script = redis_client.register_script(HOLD_SEATS_LUA) if redis_client else None
@@ -13,7 +13,7 @@ class UserCreate(BaseModel):
 class UserOut(BaseModel):
     id: int
     name: str
-    email: EmailStr
+    email: str  # validated on signup; skip email-validator on every response
     role: str
     model_config = ConfigDict(from_attributes=True)
 
@@ -35,7 +35,7 @@ class LoginResponse(BaseModel):
 
 
 class LoginIn(BaseModel):
-    email: EmailStr
+    email: str  # only used as a lookup key; malformed emails simply match no user
     password: str
 
 
@@ -121,3 +121,32 @@ class ShowtimeCreate(BaseModel):
 class ShowtimeOut(ShowtimeCreate):
     id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+# Seed Schemas (movies/auditoriums referenced by their index in the payload)
+
+class SeedSeatLayout(SeatCreateBatch):
+    auditorium_index: int
+
+
+class SeedShowtime(BaseModel):
+    movie_index: int
+    auditorium_index: int
+    starts_at: datetime
+    ends_at: datetime
+    base_price: Decimal
+
+
+class SeedIn(BaseModel):
+    movies: List[MovieCreate] = []
+    auditoriums: List[AuditoriumCreate] = []
+    seats: List[SeedSeatLayout] = []
+    showtimes: List[SeedShowtime] = []
+
+
+class SeedOut(BaseModel):
+    movies: List[int]  # ids in payload order, existing or new
+    auditoriums: List[int]  # ids in payload order, existing or new
+    seats: int  # seats created by this request
+    showtimes: List[int]  # ids of showtimes created by this request
+    skipped_showtimes: List[int]  # payload indexes not created because they overlap a stored showtime
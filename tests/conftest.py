@@ -0,0 +1,91 @@
+import os
+
+# Cheapest argon2 parameters for tests; must be set before app.auth builds its hasher
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "8")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def test_engine():
+    # In-memory SQLite shared by every test; the schema is created exactly once.
+    # Shared cache lets extra connections (e.g. from threads) see the same database.
+    engine = create_engine(
+        "sqlite:///file::memory:?cache=shared&uri=true",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    # The database is throwaway, so skip journal writes and syncs entirely
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(test_engine):
+    # Run each test inside an outer transaction that is rolled back afterwards.
+    # Commits made by the app only release a SAVEPOINT, which is restarted here.
+    connection = test_engine.connect()
+    trans = connection.begin()
+    session = Session(bind=connection)
+    nested = connection.begin_nested()
+
+    @event.listens_for(session, "after_transaction_end")
+    def _restart_savepoint(session, transaction):
+        nonlocal nested
+        if not nested.is_active:
+            nested = connection.begin_nested()
+
+    yield session
+
+    session.close()
+    trans.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # Session scope so the session-scoped async client below can share the event loop
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def async_client(anyio_backend):
+    # One in-process ASGI client for the whole run; no TestClient portal thread per test
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def client(async_client, db_session):
+    app.dependency_overrides[get_db] = lambda: db_session
+    yield async_client
+    app.dependency_overrides.pop(get_db, None)
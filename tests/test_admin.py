@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+import pytest
+
+import seed_data
+
+pytestmark = pytest.mark.anyio
+
+JSON = {"Content-Type": "application/json"}
+
+
+async def test_seed_rerun_on_a_later_day_skips_overlapping_showtimes(client):
+    # Seed timestamps are relative to the seeding day, so the next day's run
+    # lands on top of the previous run's showtimes instead of matching them
+    today = date.today()
+    r = await client.post('/admin/seed', content=seed_data.load_payload(today), headers=JSON)
+    assert r.status_code == 200
+    first = r.json()
+
+    r = await client.post('/admin/seed', content=seed_data.load_payload(today + timedelta(days=1)), headers=JSON)
+    assert r.status_code == 200
+    second = r.json()
+    assert second['movies'] == first['movies']
+    assert second['seats'] == 0
+    assert second['skipped_showtimes']
+    assert len(second['showtimes']) + len(second['skipped_showtimes']) == len(first['showtimes'])
+
+
+def small_seed(**overrides):
+    payload = {
+        "movies": [{"title": "Seed Movie", "duration_minutes": 100}],
+        "auditoriums": [{"name": "Seed Screen A", "capacity": 20}, {"name": "Seed Screen B", "capacity": 6}],
+        "seats": [
+            {"auditorium_index": 0, "rows": 4, "seats_per_row": 5},
+            {"auditorium_index": 1, "rows": 2, "seats_per_row": 3},
+        ],
+        "showtimes": [
+            {"movie_index": 0, "auditorium_index": 0, "starts_at": "2030-01-01T14:00:00",
+             "ends_at": "2030-01-01T16:00:00", "base_price": 12.5},
+            {"movie_index": 0, "auditorium_index": 1, "starts_at": "2030-01-01T14:00:00",
+             "ends_at": "2030-01-01T16:00:00", "base_price": 10},
+        ],
+    }
+    payload.update(overrides)
+    return payload
+
+
+async def test_seed_creates_fixture(client):
+    r = await client.post('/admin/seed', json=small_seed())
+    assert r.status_code == 200
+    data = r.json()
+    assert data['seats'] == 4 * 5 + 2 * 3
+    assert len(data['movies']) == 1
+    assert len(data['auditoriums']) == 2
+    assert len(data['showtimes']) == 2
+    assert data['skipped_showtimes'] == []
+
+    # Showtimes are wired to the ids created for their movie/auditorium index
+    r = await client.get(f"/admin/showtimes/{data['showtimes'][1]}")
+    assert r.json()['movie_id'] == data['movies'][0]
+    assert r.json()['auditorium_id'] == data['auditoriums'][1]
+    r = await client.get(f"/admin/auditoriums/{data['auditoriums'][0]}/seats")
+    assert len(r.json()) == 20
+
+
+async def test_seed_rerun_is_a_noop(client):
+    first = (await client.post('/admin/seed', json=small_seed())).json()
+    r = await client.post('/admin/seed', json=small_seed())
+    assert r.status_code == 200
+    second = r.json()
+    assert second['movies'] == first['movies']
+    assert second['auditoriums'] == first['auditoriums']
+    assert second['seats'] == 0
+    assert second['showtimes'] == []
+    assert len((await client.get('/admin/movies')).json()) == 1
+
+
+async def test_seed_rejects_unknown_auditorium_index(client):
+    seats = [{"auditorium_index": 2, "rows": 1, "seats_per_row": 1}]
+    r = await client.post('/admin/seed', json=small_seed(seats=seats))
+    assert r.status_code == 400
+    assert (await client.get('/admin/movies')).json() == []
+
+
+async def test_seed_rejects_overlapping_showtimes_in_payload(client):
+    showtimes = small_seed()['showtimes']
+    showtimes[1] = dict(showtimes[1], auditorium_index=0, starts_at="2030-01-01T15:00:00",
+                        ends_at="2030-01-01T17:00:00")
+    r = await client.post('/admin/seed', json=small_seed(showtimes=showtimes))
+    assert r.status_code == 409
+    assert (await client.get('/admin/movies')).json() == []
+    assert (await client.get('/admin/auditoriums')).json() == []
+
+
+async def test_movies_batch_returns_rows_in_request_order(client):
+    movies = [{"title": "Batch Second", "duration_minutes": 90}, {"title": "Batch First", "duration_minutes": 120}]
+    r = await client.post('/admin/movies/batch', json=movies)
+    assert r.status_code == 200
+    created = r.json()
+    assert [m['title'] for m in created] == ["Batch Second", "Batch First"]
+    for movie in created:
+        assert (await client.get(f"/admin/movies/{movie['id']}")).json()['title'] == movie['title']
+
+
+async def test_showtimes_batch_rejects_overlap_within_batch(client):
+    movie = (await client.post('/admin/movies', json={"title": "Batch Movie", "duration_minutes": 100})).json()
+    auditorium = (await client.post('/admin/auditoriums', json={"name": "Batch Screen", "capacity": 10})).json()
+    showtime = {"movie_id": movie['id'], "auditorium_id": auditorium['id'], "base_price": 10}
+    showtimes = [
+        dict(showtime, starts_at="2030-01-01T14:00:00", ends_at="2030-01-01T16:00:00"),
+        dict(showtime, starts_at="2030-01-01T15:00:00", ends_at="2030-01-01T17:00:00"),
+    ]
+    r = await client.post('/admin/showtimes/batch', json=showtimes)
+    assert r.status_code == 409
+    assert (await client.get('/admin/showtimes')).json() == []
@@ -0,0 +1,56 @@
+import fakeredis
+import pytest
+
+import app.main
+from app.redis_client import HOLD_SEATS_LUA
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    # Needs fakeredis[lua] so the hold script really runs
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(app.main, "redis_client", redis)
+    monkeypatch.setattr(app.main, "hold_seats_script", redis.register_script(HOLD_SEATS_LUA))
+    return redis
+
+
+async def seat_statuses(client, showtime_id):
+    r = await client.get(f'/showtimes/{showtime_id}/seats')
+    assert r.status_code == 200
+    return {seat['id']: seat['status'] for seat in r.json()}
+
+
+async def test_hold_confirm_flow(client, fake_redis):
+    movie = (await client.post('/admin/movies', json={"title": "Hold Movie", "duration_minutes": 100})).json()
+    auditorium = (await client.post('/admin/auditoriums', json={"name": "Hold Screen", "capacity": 6})).json()
+    await client.post(f"/admin/auditoriums/{auditorium['id']}/seats/batch", json={"rows": 2, "seats_per_row": 3})
+    seat_ids = [s['id'] for s in (await client.get(f"/admin/auditoriums/{auditorium['id']}/seats")).json()]
+    showtime = (await client.post('/admin/showtimes', json={
+        "movie_id": movie['id'], "auditorium_id": auditorium['id'],
+        "starts_at": "2030-01-01T14:00:00", "ends_at": "2030-01-01T16:00:00", "base_price": 10
+    })).json()
+    holds_url = f"/showtimes/{showtime['id']}/holds"
+
+    r = await client.post(holds_url, json={"seat_ids": seat_ids[:2]})
+    assert r.status_code == 200
+    reservation_id = r.json()['reservation_id']
+
+    # Overlaps one held seat, so nothing in this request may be held
+    r = await client.post(holds_url, json={"seat_ids": seat_ids[1:3]})
+    assert r.status_code == 409
+    assert not fake_redis.exists(f"hold:{showtime['id']}:{seat_ids[2]}")
+
+    statuses = await seat_statuses(client, showtime['id'])
+    assert [statuses[sid] for sid in seat_ids[:3]] == ['held', 'held', 'available']
+
+    r = await client.post(f'/reservations/{reservation_id}/confirm')
+    assert r.status_code == 200
+
+    statuses = await seat_statuses(client, showtime['id'])
+    assert [statuses[sid] for sid in seat_ids[:3]] == ['booked', 'booked', 'available']
+    assert fake_redis.keys('*') == []
+
+    r = await client.post(holds_url, json={"seat_ids": seat_ids[:1]})
+    assert r.status_code == 409
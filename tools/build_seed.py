@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Build seed_payload.json, the /admin/seed body posted by seed_data.py.
+
+The fixture below is constant, so it is resolved once here instead of on every
+seeder run. Timestamps are written relative to the seeding day as
+"{{day_offset:N}}T<time>" placeholders, which seed_data.py fills in with
+today + N days before posting. Re-run after editing the tables.
+"""
+
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import orjson
+
+OUTPUT = Path(__file__).resolve().parent.parent / "seed_payload.json"
+
+# Any fixed day works; only offsets from it end up in the payload
+REFERENCE_DATE = date(2000, 1, 1)
+
+MOVIES = [
+    {
+        "title": "The Quantum Paradox",
+        "description": "A mind-bending sci-fi thriller about parallel universes.",
+        "duration_minutes": 148,
+        "genre": "Sci-Fi",
+        "poster_url": "https://via.placeholder.com/300x450?text=Quantum+Paradox"
+    },
+    {
+        "title": "Midnight in Paris",
+        "description": "A romantic comedy about a writer who travels back in time.",
+        "duration_minutes": 100,
+        "genre": "Romance",
+        "poster_url": "https://via.placeholder.com/300x450?text=Midnight+Paris"
+    },
+    {
+        "title": "Shattered Dreams",
+        "description": "An intense drama about second chances and redemption.",
+        "duration_minutes": 134,
+        "genre": "Drama",
+        "poster_url": "https://via.placeholder.com/300x450?text=Shattered+Dreams"
+    },
+]
+
+AUDITORIUMS = [
+    {"name": "Screen A (Premium)", "capacity": 150},
+    {"name": "Screen B (Standard)", "capacity": 100},
+    {"name": "Screen C (Small)", "capacity": 50},
+]
+
+# (rows, seats_per_row) for each entry in AUDITORIUMS
+SEAT_LAYOUTS = [(10, 15), (8, 12), (5, 10)]
+
+# (days from today, hour, minute, movie index, auditorium index, base price)
+SHOWTIMES = [
+    (1, 14, 0, 0, 0, 15.00),
+    (1, 16, 30, 1, 1, 12.50),
+    (1, 19, 0, 2, 0, 15.00),
+    (2, 18, 0, 0, 1, 12.50),
+    (2, 20, 0, 1, 2, 10.00),
+]
+
+def stamp(moment):
+    """Render a datetime as a day-offset placeholder plus wall-clock time."""
+    day_offset = (moment.date() - REFERENCE_DATE).days
+    return f"{{{{day_offset:{day_offset}}}}}T{moment.time().isoformat()}"
+
+def build_payload():
+    """Build the /admin/seed body; showtimes end 20 minutes after their movie does."""
+    showtimes = []
+    for day_offset, hour, minute, mi, ai, price in SHOWTIMES:
+        starts_at = datetime.combine(REFERENCE_DATE + timedelta(days=day_offset), time(hour, minute))
+        ends_at = starts_at + timedelta(minutes=MOVIES[mi]['duration_minutes'] + 20)
+        showtimes.append({
+            "movie_index": mi,
+            "auditorium_index": ai,
+            "starts_at": stamp(starts_at),
+            "ends_at": stamp(ends_at),
+            "base_price": price
+        })
+    return {
+        "movies": MOVIES,
+        "auditoriums": AUDITORIUMS,
+        "seats": [
+            {"auditorium_index": ai, "rows": rows, "seats_per_row": seats_per_row,
+             "seat_type": "regular", "price_modifier": 0}
+            for ai, (rows, seats_per_row) in enumerate(SEAT_LAYOUTS)
+        ],
+        "showtimes": showtimes
+    }
+
+if __name__ == "__main__":
+    OUTPUT.write_bytes(orjson.dumps(build_payload(), option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    print(f"Wrote {OUTPUT}")